@@ -1,6 +1,11 @@
 from importlib import import_module
 
 
-def simulate(casino_game):
+def simulate(casino_game, **options):
     game = import_module(f".{casino_game}", "casino_simulator")
-    game.simulate()
+    game.simulate(**options)
+
+
+def benchmark(casino_game):
+    game = import_module(f".{casino_game}", "casino_simulator")
+    game.benchmark()
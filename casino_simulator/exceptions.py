@@ -4,3 +4,11 @@ class InvalidObjectError(TypeError):
 
 class InvalidBetError(ValueError):
     pass
+
+
+class MemoryBudgetError(MemoryError):
+    pass
+
+
+class TapeExhaustedError(IndexError):
+    pass
@@ -229,8 +229,15 @@ class Table(abc.ABC):
 
 
 class Player(abc.ABC):
+    """A participant in a casino table game.
+
+    A :class:'Player' decides on a :class:'Bet' at most once per round: the
+    decision made while checking whether they are still :meth:'playing' is the
+    same :class:'Bet' that is later placed on the :class:'Table'.
+    """
     stake = None
     table = None
+    bet = None
 
     def __init__(self, table):
         self.table = table
@@ -251,7 +258,10 @@ class Player(abc.ABC):
         pass
 
     def playing(self):
-        # maybe this should do more
+        """Decides whether the :class:'Player' takes part in the next round.
+
+        :return bool:
+        """
         return self.can_continue()
 
     @abc.abstractmethod
@@ -0,0 +1,94 @@
+import inspect
+import tracemalloc
+
+UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(size):
+    """Converts a size such as '512K', '64M' or '1G' into a number of bytes.
+
+        >>> parse_size('64M')
+        67108864
+    """
+    text = str(size).strip().upper().rstrip("B")
+    if text and text[-1] in UNITS:
+        size = int(float(text[:-1]) * UNITS[text[-1]])
+    else:
+        size = int(text)
+    if size <= 0:
+        raise ValueError("size must be positive: %r" % text)
+    return size
+
+
+class MemoryProfiler(object):
+    """Attributes memory allocations to the subsystems of a simulation.
+
+    Each subsystem is a group of classes or functions. Every allocation traced
+    by :mod:'tracemalloc' is attributed to the subsystem of the most recent
+    frame of its traceback lying inside one of them, or to 'other'. Snapshots
+    are taken every 'interval' calls to :meth:'sample' and the largest total
+    seen for every subsystem is kept as its peak.
+
+    Profiling a simulation.
+        >>> profiler = MemoryProfiler({'bets': [Bet]})
+        >>> profiler.start()
+        >>> simulator.set_monitor(profiler)
+        >>> simulator.gather()
+        >>> print(profiler.stop())
+    """
+
+    def __init__(self, components, interval=10, frames=25):
+        """Initialize the profiler.
+
+        :param components: Mapping of subsystem names to classes or functions.
+        :param interval: Number of calls to :meth:'sample' between snapshots.
+        :param frames: Number of frames kept for every traced allocation.
+        """
+        self.interval, self.frames, self.calls = (interval, frames, 0)
+        self.names = list(components) + ["other"]
+        self.peaks, self.peak = (dict.fromkeys(self.names, 0), 0)
+        self.ranges = list()
+        for name, members in components.items():
+            for member in members:
+                lines, first = inspect.getsourcelines(member)
+                filename = inspect.getsourcefile(member)
+                self.ranges.append((filename, first, first + len(lines), name))
+
+    def start(self):
+        tracemalloc.start(self.frames)
+
+    def classify(self, traceback):
+        """Returns the subsystem an allocation's traceback belongs to."""
+        for frame in reversed(traceback):
+            for filename, first, last, name in self.ranges:
+                if frame.filename == filename and first <= frame.lineno < last:
+                    return name
+        return "other"
+
+    def sample(self, force=False):
+        """Takes a snapshot every 'interval' calls and updates the peaks."""
+        self.calls += 1
+        if not (force or self.calls % self.interval == 0):
+            return
+
+        totals = dict.fromkeys(self.names, 0)
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)])
+        for stat in snapshot.statistics("traceback"):
+            totals[self.classify(stat.traceback)] += stat.size
+        for name, size in totals.items():
+            self.peaks[name] = max(self.peaks[name], size)
+
+    def stop(self):
+        """Stops tracing and returns the report."""
+        self.sample(force=True)
+        self.peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return self.report()
+
+    def report(self):
+        width = max([len(name) for name in self.names])
+        lines = ["Memory"]
+        for name, size in [("peak", self.peak)] + list(self.peaks.items()):
+            lines.append(f"    {name:<{width}}: {size / 1024:.1f} KiB")
+        return "\n".join(lines)
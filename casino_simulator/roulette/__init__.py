@@ -1,5 +1,12 @@
 import statistics
-from .gameObjects import RouletteSimulator
+import time
+from ..exceptions import MemoryBudgetError
+from ..gameObjects import Bet, Player
+from ..profiling import MemoryProfiler
+from ..trajectories import TrajectoryStore
+from .gameObjects import (Bin, Wheel, BinBuilder, RouletteTable,
+                          RoulettePlayer, Passenger57, Martingale,
+                          RouletteSimulator)
 
 configurations = {
     "player_class": "Martingale",
@@ -9,8 +16,14 @@ configurations = {
     }
 }
 
+components = {
+    "stakes": [RouletteSimulator, TrajectoryStore],
+    "bets": [Bet, Player, RoulettePlayer, Passenger57, Martingale],
+    "wheel": [Bin, Wheel, BinBuilder, RouletteTable],
+}
+
 
-def simulate():
+def simulate(profile_memory=False, memory_budget=None):
     answer = input("Use custom configurations? (Yes/No) ")
     if answer == "Yes":
         configurations["player_class"] = input("Player (Available: Martingale): ")
@@ -18,10 +31,26 @@ def simulate():
         mx = int(input("Max table limit: "))
         configurations["configurations"]["game"]["table_limits"] = {"max": mx, "min": mn}
 
+    if profile_memory:
+        profiler = MemoryProfiler(components)
+        profiler.start()
+
     simulator = RouletteSimulator(**configurations)
-    simulator.gather()
+    if profile_memory:
+        simulator.set_monitor(profiler)
+    try:
+        if memory_budget is not None:
+            simulator.set_memory_budget(memory_budget)
+        simulator.gather()
+    except MemoryBudgetError as error:
+        print(f"Memory budget exceeded: {error}")
     durations, maxima = simulator.durations, simulator.maxima
 
+    if len(durations) < 2:
+        if profile_memory:
+            print(profiler.stop())
+        return
+
     print(f"""
 {configurations["player_class"]}
 Durations
@@ -35,4 +64,34 @@ Maxima
     max : {max(maxima)}
     mean: {statistics.mean(maxima):.2f}
     dev : {statistics.stdev(maxima):.2f}
+""")
+    if profile_memory:
+        print(profiler.stop())
+
+
+class CountingMartingale(Martingale):
+    """A :class:'Martingale' that counts how many bets it decides on."""
+    decisions = 0
+
+    def make_bet(self):
+        CountingMartingale.decisions += 1
+        return super(CountingMartingale, self).make_bet()
+
+
+def benchmark(samples=2000):
+    """Measures the cost of a single round of a :class:'Martingale' session."""
+    simulator = RouletteSimulator(**configurations)
+    simulator.players = dict(simulator.players, Martingale=CountingMartingale)
+    simulator.create_player("Martingale")
+    CountingMartingale.decisions = 0
+
+    rounds, start = 0, time.perf_counter()
+    for sample in range(samples):
+        rounds += len(simulator.session())
+    elapsed = time.perf_counter() - start
+
+    print(f"""
+Martingale ({samples} sessions, {rounds} rounds)
+    time/round: {elapsed / rounds * 1e6:.2f} us
+    bets/round: {CountingMartingale.decisions / rounds:.2f}
 """)
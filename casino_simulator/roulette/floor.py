@@ -0,0 +1,278 @@
+import heapq
+import itertools
+import random
+from collections import deque, namedtuple
+from .gameObjects import Wheel, RouletteTable, RouletteSimulator
+
+ARRIVAL, SPIN = 0, 1
+
+TableReport = namedtuple(
+    "TableReport", ["number", "spins", "rounds", "throughput", "occupancy"]
+)
+
+
+class FloorTable(RouletteTable):
+    """A :class:'RouletteTable' on a casino floor with a limited number of
+    seats.
+
+    Besides the :class:'Bet's on it, a :class:'FloorTable' keeps track of the
+    :class:'Player's seated at it and of the seat time they accumulate, from
+    which its occupancy is derived.
+    """
+
+    def __init__(self, number, seats=7, _min=10, _max=500, wheel=None):
+        """Initialize a new :class:'FloorTable' with a number of seats.
+
+        :param wheel: The :class:'Wheel' to spin, a new one by default.
+        """
+        self.wheel = wheel
+        super(FloorTable, self).__init__(_min, _max)
+        self.number, self.seats, self.players = (number, seats, list())
+        self.spins, self.rounds = (0, 0)
+        self.seat_time, self.changed = (0.0, 0.0)
+        self.pending = False
+
+    def build_components(self):
+        if self.wheel is None:
+            super(FloorTable, self).build_components()
+
+    def has_seat(self):
+        return len(self.players) < self.seats
+
+    def seat(self, player, now):
+        """Seats a :class:'Player' at the :class:'FloorTable'."""
+        self.account(now)
+        self.players.append(player)
+        player.table = self
+
+    def unseat(self, player, now):
+        """Removes a :class:'Player' from the :class:'FloorTable'."""
+        self.account(now)
+        self.players.remove(player)
+
+    def account(self, now):
+        """Accumulates the seat time spent since the last seating change."""
+        self.seat_time += len(self.players) * (now - self.changed)
+        self.changed = now
+
+    def __repr__(self):
+        """The type representation of a :class:'FloorTable' object."""
+        return "<FloorTable %d '%d/%d Seats'>" % (
+            self.number, len(self.players), self.seats)
+
+
+class RouletteFloor(object):
+    """A casino floor of :class:'FloorTable's simulated over time.
+
+    :class:'Player's arrive as a Poisson process, take a free seat (or queue
+    for one), play until they run out of rounds or money and occasionally
+    switch tables. Events are kept in a heap, and only tables with seated
+    :class:'Player's have a pending spin, so idle tables cost nothing.
+
+    Running a floor simulation.
+        >>> configurations = {
+        ...     "floor": {"tables": 10, "players": 100},
+        ...     "session": {"init_duration": 250, "init_stake": 100},
+        ... }
+        >>> floor = RouletteFloor(configurations, "Martingale", seed=1)
+        >>> reports = floor.run()
+    """
+    tables_count = 100
+    seats = 7
+    spin_interval = 60.0
+    switch_rate = 0.05
+    players_count = 1000
+    arrival_rate = 1.0
+    init_duration = 250
+    init_stake = 100
+
+    def __init__(self, configurations, player_class, seed=None):
+        """Initializes the floor with its tables and arrival process.
+
+        :param configurations: The "floor" and "session" configurations.
+        :param player_class: The name of the :class:'Player' class to use.
+        :param seed: Seed for arrivals, table choices, switching and every
+            table's :class:'Wheel', and for the global :mod:'random' module,
+            which players such as :class:'Martingale' use to choose their
+            outcomes. Runs are only reproducible with a seed.
+        """
+        if seed is not None:
+            random.seed(seed)
+        self.rng = random.Random(seed)
+        self.player_class = RouletteSimulator.players[player_class]
+        self.setup_floor(configurations["floor"])
+        self.setup_session(configurations["session"])
+
+        self.events, self.sequence = (list(), itertools.count())
+        self.waiting, self.vacant, self.position = (deque(), list(), dict())
+        self.now, self.arrived, self.departed, self.switches = (0.0, 0, 0, 0)
+        self.waited = 0.0
+        for table in self.tables:
+            self.open(table)
+
+    def setup_floor(self, configurations):
+        limits = configurations.get("table_limits", {"min": 10, "max": 500})
+        self.tables_count = configurations.get("tables", self.tables_count)
+        self.seats = configurations.get("seats", self.seats)
+        self.spin_interval = configurations.get(
+            "spin_interval", self.spin_interval)
+        self.switch_rate = configurations.get("switch_rate", self.switch_rate)
+        self.players_count = configurations.get("players", self.players_count)
+        self.arrival_rate = configurations.get(
+            "arrival_rate", self.arrival_rate)
+        # The bins are built once and shared, as building them is by far the
+        # most expensive part of setting up a table.
+        bins = Wheel().bins
+        self.tables = tuple([
+            FloorTable(number, self.seats, limits["min"], limits["max"],
+                       Wheel(random.Random(self.rng.getrandbits(64)), bins))
+            for number in range(self.tables_count)
+        ])
+
+    def setup_session(self, configurations):
+        self.init_duration = configurations["init_duration"]
+        self.init_stake = configurations["init_stake"]
+
+    def schedule(self, time, kind, subject=None):
+        heapq.heappush(self.events, (time, next(self.sequence), kind, subject))
+
+    def open(self, table):
+        """Marks a :class:'FloorTable' as having a free seat."""
+        if table.number not in self.position:
+            self.position[table.number] = len(self.vacant)
+            self.vacant.append(table)
+
+    def fill(self, table):
+        """Marks a :class:'FloorTable' as full."""
+        index = self.position.pop(table.number, None)
+        if index is None:
+            return
+        last = self.vacant.pop()
+        if last is not table:
+            self.vacant[index] = last
+            self.position[last.number] = index
+
+    def run(self, until=None):
+        """Processes events until none are left or the time limit is reached.
+
+        :param until: The simulated time at which to stop.
+        :return list: A :class:'TableReport' for every table.
+        """
+        if not self.events and self.arrived < self.players_count:
+            self.schedule(self.rng.expovariate(self.arrival_rate), ARRIVAL)
+
+        while self.events:
+            if until is not None and self.events[0][0] > until:
+                self.now = until
+                break
+            self.now, _, kind, subject = heapq.heappop(self.events)
+            if kind == ARRIVAL:
+                self.arrive()
+            else:
+                self.spin(subject)
+        return self.report()
+
+    def arrive(self):
+        """Handles the arrival of a new :class:'Player' on the floor."""
+        self.arrived += 1
+        if self.arrived < self.players_count:
+            delay = self.rng.expovariate(self.arrival_rate)
+            self.schedule(self.now + delay, ARRIVAL)
+
+        if self.vacant:
+            self.join(self.rng.choice(self.vacant))
+        else:
+            self.waiting.append(self.now)
+
+    def join(self, table, player=None):
+        """Seats a new or switching :class:'Player' at a :class:'FloorTable'
+        and wakes the table up if it was idle."""
+        if player is None:
+            player = self.player_class(table)
+            player.set_stake(self.init_stake)
+            player.set_rounds(self.init_duration)
+        table.seat(player, self.now)
+        if not table.has_seat():
+            self.fill(table)
+        if not table.pending:
+            table.pending = True
+            self.schedule(self.now + self.spin_interval, SPIN, table)
+
+    def leave(self, table, player):
+        """Frees a player's seat, handing it to the next one waiting."""
+        table.unseat(player, self.now)
+        self.open(table)
+        if self.waiting:
+            self.waited += self.now - self.waiting.popleft()
+            self.join(table)
+
+    def stranded(self, table, player):
+        """Whether the player's own bet can never be placed at the table."""
+        bet = player.bet
+        return (player.rounds <= 0 or bet is None or bet.amount > player.stake
+                or not table.max >= bet.amount >= table.min)
+
+    def spin(self, table):
+        """Plays one round at a :class:'FloorTable'.
+
+        Seated :class:'Player's who cannot bet any more leave the floor, and
+        those whose bet merely does not fit next to the others sit the round
+        out.
+        """
+        table.pending = False
+        wagers = list()
+        for player in list(table.players):
+            if player.playing():
+                bet = player.bet
+                player.place_bet()
+                wagers.append((player, bet))
+            elif self.stranded(table, player):
+                self.departed += 1
+                self.leave(table, player)
+
+        if wagers:
+            win_bin = table.wheel.next()
+            for player, bet in wagers:
+                if bet.outcome in win_bin.outcomes:
+                    player.win(bet)
+                else:
+                    player.lose(bet)
+            table.clear()
+            table.spins += 1
+            table.rounds += len(wagers)
+
+        for player, bet in wagers:
+            if self.vacant and self.rng.random() < self.switch_rate:
+                self.switch(table, player)
+
+        if table.players and not table.pending:
+            table.pending = True
+            self.schedule(self.now + self.spin_interval, SPIN, table)
+
+    def switch(self, table, player):
+        """Moves a :class:'Player' to a random other table with a free seat."""
+        other = self.rng.choice(self.vacant)
+        if other is table:
+            return
+        self.switches += 1
+        self.join(other, player)
+        self.leave(table, player)
+
+    def report(self):
+        """Reports the throughput and occupancy of every table.
+
+        Throughput is the number of spins per unit of simulated time and
+        occupancy the fraction of available seat time that was used.
+
+        :return list: A :class:'TableReport' for every table.
+        """
+        elapsed = self.now or 1.0
+        reports = list()
+        for table in self.tables:
+            table.account(self.now)
+            reports.append(TableReport(
+                table.number, table.spins, table.rounds,
+                table.spins / elapsed,
+                table.seat_time / (table.seats * elapsed),
+            ))
+        return reports
@@ -1,7 +1,16 @@
+import gc
+import os
 import random
+import tracemalloc
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from ..gameObjects import (Outcome, OutcomeFactory, Bet, Table, Player, Game,
                            Simulator)
-from ..exceptions import InvalidObjectError
+from ..exceptions import InvalidObjectError, MemoryBudgetError
+from ..trajectories import TrajectoryStore
+
+Session = namedtuple("Session", ["duration", "maximum", "final", "ruined"])
 
 
 class Bin(object):
@@ -89,16 +98,29 @@ class Wheel(object):
     Creating a :class:'Wheel' with a custome number generator
         >>> rng = NonRandom()  # Custom random number generator
         >>> wheel = Wheel(rng)
+
+    Creating a :class:'Wheel' sharing the :class:'Bin's of another
+        >>> other = Wheel(rng, wheel.bins)
     """
     bins = None
     builder = None
     outcomes = set()
+    choices = None
+
+    def __init__(self, rng=None, bins=None):
+        """Initialize a Wheel with 38 Bins and a random number generator.
 
-    def __init__(self, rng=None):
-        """Initialize a Wheel with 38 Bins and a random number generator."""
+        :param rng: The random number generator to spin with.
+        :param bins: The :class:'Bin's of another :class:'Wheel' to share
+            instead of building new ones. :class:'Outcome's added to either
+            :class:'Wheel' then show up on both.
+        """
         self.rng = random.Random() if rng is None else rng
         self.builder = BinBuilder(self)
-        self.build_components()
+        if bins is None:
+            self.build_components()
+        else:
+            self.bins = bins
 
     def build_components(self):
         self.builder.build_bins()
@@ -113,6 +135,7 @@ class Wheel(object):
             return NotImplemented
         self.bins[number].add(outcome)
         self.outcomes.add(outcome)
+        self.choices = None
 
     def get_outcome(self, name):
         """Returns the specified outcome.
@@ -129,15 +152,30 @@ class Wheel(object):
     def get_random_outcome(self):
         """Returns a random outcome.
 
+        The candidates are kept in a tuple which is only rebuilt when the
+        collection of :class:'Outcome's changes. It is sorted by name, since
+        the order of a set of :class:'Outcome's changes with the string hash
+        seed of every process, and seeded choices would not be reproducible.
+
         :return Outcome:
         """
-        return random.choice(list(self.outcomes))
+        if self.choices is None or len(self.choices) != len(self.outcomes):
+            self.choices = tuple(
+                sorted(self.outcomes, key=lambda outcome: outcome.name))
+        return random.choice(self.choices)
+
+    def start(self):
+        """Marks the start of a session. A :class:'Wheel' drawing fresh
+        randomness has nothing to do here."""
+
+    def close(self):
+        """Releases what the :class:'Wheel' holds on to. A :class:'Wheel'
+        drawing fresh randomness holds nothing."""
 
     def next(self):
         """Generates a random number between 0 and 37, and returns the
         randomly selected Bin."""
-        choice = self.rng.choice([num for num in range(38)])
-        return self.bins[choice]
+        return self.bins[self.rng.randrange(38)]
 
     def get(self, number):
         """Returns the specified Bin from the internal collection."""
@@ -265,7 +303,7 @@ class BinBuilder(object):
                 self.wheel.add_outcome(n, even)
 
             if n in [1, 3, 5, 7, 9, 12, 14, 16, 18,
-                     19, 21, 23, 25, 30, 32, 34, 36]:
+                     19, 21, 23, 25, 27, 30, 32, 34, 36]:
                 self.wheel.add_outcome(n, red)
             else:
                 self.wheel.add_outcome(n, black)
@@ -301,19 +339,51 @@ class RouletteTable(Table):
 
 class RoulettePlayer(Player):
     rounds = 250
+    accepted = False
 
     def set_rounds(self, rounds):
         self.rounds = rounds
 
     def can_continue(self):
-        bet = self.make_bet()
-        return self.rounds > 0 and self.can_bet(bet)
+        """Decides on the :class:'Bet' for the coming round.
+
+        The :class:'Bet' is only made when the :class:'Player' has rounds left
+        and is kept until it is placed, together with whether it was accepted,
+        so every round costs exactly one call to :meth:'make_bet' and one to
+        :meth:'can_bet'.
+
+        :return bool: Whether the decided :class:'Bet' can be placed.
+        """
+        if self.rounds <= 0:
+            self.bet, self.accepted = (None, False)
+            return False
+        self.bet = self.make_bet()
+        self.accepted = self.can_bet(self.bet)
+        return self.accepted
+
+    def is_ruined(self):
+        """Whether the :class:'Player' can no longer afford to play: the stake
+        is below the table minimum or short of the :class:'Bet' decided on.
+
+        A :class:'Bet' rejected by the table alone, such as one over the table
+        maximum, does not ruin a :class:'Player' who could still pay for it.
+        """
+        bet = self.bet
+        return self.stake < self.table.min or (
+            bet is not None and bet.amount > self.stake)
 
     def place_bet(self):
-        self.rounds -= 1
-        bet = self.make_bet()
-        if not (self.can_continue() and self.can_bet(bet)):
+        """Places the :class:'Bet' decided on for this round.
+
+        Only a :class:'Bet' accepted by :meth:'playing' is placed, without
+        validating it again; a rejected one is kept for inspection.
+        """
+        if self.bet is None:
+            self.can_continue()
+        if not self.accepted:
             return
+        bet, self.bet, self.accepted = (self.bet, None, False)
+        self.rounds -= 1
         self.stake -= bet.amount
         self.table.place_bet(bet)
 
@@ -397,9 +467,27 @@ class RouletteSimulator(Simulator):
     init_stake = 100
     samples = 50
     player_class = None
+    trajectories = None
+    memory_budget = None
+    streaming = False
+    monitor = None
+    ruined = False
+    tape = None
+    # Estimated bytes per round of a session collected into a list (a list
+    # slot and an int object), per round and per session of an encoded
+    # trajectory, and per session of gathered durations and maxima.
+    round_bytes = 36
+    trajectory_bytes = (2, 40)
+    result_bytes = 16
+    # Fraction of the budget the plan may take up before :meth:'gather' is
+    # traced to check that the budget holds.
+    headroom = 0.5
+    traced = False
+    players = {'Passenger57': Passenger57, 'Martingale': Martingale}
 
     def __init__(self, configurations, player_class):
         super(RouletteSimulator, self).__init__(configurations, player_class)
+        self.configurations = configurations
         self.durations, self.maxima = (list(), list())
 
     def setup_session(self, configurations):
@@ -410,6 +498,13 @@ class RouletteSimulator(Simulator):
         self.set_init_duration(session_config["init_duration"])
         self.set_init_stake(session_config["init_stake"])
         self.set_samples(session_config["samples"])
+        if session_config.get("trajectories", False):
+            self.trajectories = TrajectoryStore()
+        self.player_config = configurations.get("player", {})
+        if session_config.get("tape") is not None:
+            from .tapes import SpinTape, TapeWheel
+            self.tape = SpinTape(session_config["tape"])
+            self.game.table.wheel = TapeWheel(self.tape)
 
     def set_init_duration(self, duration):
         self.init_duration = duration
@@ -420,29 +515,250 @@ class RouletteSimulator(Simulator):
     def set_samples(self, samples):
         self.samples = samples
 
+    def set_memory_budget(self, budget):
+        """Plans :meth:'gather' to stay under a number of bytes of traced
+        memory, counting the game's wheel and table as well as the results.
+
+        The cost of the game is measured with :mod:'tracemalloc' and that of
+        the results estimated from the number of samples and rounds. When the
+        trajectories would not fit, they are dropped; when collecting sessions
+        into lists would not fit, sessions are streamed round by round. A
+        budget that cannot even hold the game and the durations and maxima
+        raises a :class:'MemoryBudgetError' before any work is done.
+
+        Tracing slows a simulation down several times, so :meth:'gather' is
+        only traced when the plan takes up more than 'headroom' of the budget.
+        """
+        self.memory_budget = budget
+        self.durations = array('q', self.durations)
+        self.maxima = array('q', self.maxima)
+
+        self.fixed = self.measure_game()
+        required = self.fixed + self.samples * self.result_bytes
+        if required > budget:
+            raise MemoryBudgetError(
+                "%d sessions need at least %d bytes, over the budget of %d" % (
+                    self.samples, required, budget))
+
+        if self.trajectories is not None:
+            per_round, per_session = self.trajectory_bytes
+            stored = self.samples * (
+                per_round * self.init_duration + per_session)
+            if required + stored > budget:
+                self.trajectories = None
+            else:
+                required += stored
+        listed = required + self.round_bytes * self.init_duration
+        self.streaming = listed > budget
+        planned = required if self.streaming else listed
+        self.traced = planned > self.headroom * budget
+
+    def measure_game(self):
+        """Measures the bytes taken by the simulator's game.
+
+        When memory is already being traced, the game is part of what has
+        been traced so far; otherwise a game like it is built and measured.
+
+        :return int:
+        """
+        if tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+
+        tracemalloc.start()
+        game = RouletteGame(self.configurations["game"])
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del game
+        gc.collect()
+        return size
+
+    def close(self):
+        """Closes the table's :class:'Wheel' and the tape opened for it, if
+        any."""
+        self.game.table.wheel.close()
+        if self.tape is not None:
+            self.tape.close()
+            self.tape = None
+
+    def set_monitor(self, monitor):
+        """Sets an object whose 'sample' method is called after every
+        session, while the session's stakes are still alive."""
+        self.monitor = monitor
+
     def create_player(self, player_class=None):
-        available = {
-            'Passenger57': Passenger57, 'Martingale': Martingale,
-        }
         if player_class is not None:
             self.player_class = player_class
 
-        self.player = available[self.player_class](self.game.table)
+        self.player = self.players[self.player_class](
+            self.game.table, **self.player_config)
         self.player.set_stake(self.init_stake)
         self.player.set_rounds(self.init_duration)
 
-    def session(self):
-        stakes = list()
+    def play(self):
+        """Plays a session, yielding the stake held after every round.
 
-        while self.player.playing():
-            self.game.cycle(self.player)
-            stakes.append(int(self.player.stake))
+        A fresh player is created once the session is over, or as soon as the
+        generator is closed, so a session may be abandoned part way through.
+        Whether the player it ended with was ruined is kept in 'ruined'.
+        """
+        self.game.table.wheel.start()
+        try:
+            while self.player.playing():
+                self.game.cycle(self.player)
+                yield int(self.player.stake)
+        finally:
+            self.ruined = self.player.is_ruined()
+            self.create_player()
 
-        self.create_player()
-        return stakes
+    def session(self):
+        return list(self.play())
 
     def gather(self):
+        if self.memory_budget is not None:
+            return self.stream()
+
         for sample in range(self.samples):
             session = self.session()
             self.durations.append(len(session))
-            self.maxima.append(max(session))
+            self.maxima.append(max(session, default=self.init_stake))
+            if self.trajectories is not None:
+                self.trajectories.append(session, self.init_stake)
+            if self.monitor is not None:
+                self.monitor.sample()
+
+    def summarize(self, stakes):
+        """Consumes the stakes of a session one round at a time.
+
+        :return Session: The duration, maximum and final stake of the session
+            and whether the player was ruined, as decided by
+            :meth:'RoulettePlayer.is_ruined' once the stakes are consumed.
+        """
+        duration, maximum, final = (0, None, self.init_stake)
+        for final in stakes:
+            duration += 1
+            if maximum is None or final > maximum:
+                maximum = final
+        maximum = self.init_stake if maximum is None else maximum
+        return Session(duration, maximum, final, self.ruined)
+
+    def stream(self):
+        """Gathers sessions as planned by :meth:'set_memory_budget'.
+
+        When the plan leaves little headroom, or memory is being traced
+        anyway, a :class:'MemoryBudgetError' is raised as soon as the traced
+        memory goes over the budget, keeping the sessions gathered so far.
+        """
+        tracing = tracemalloc.is_tracing()
+        traced = tracing or self.traced
+        if traced and not tracing:
+            tracemalloc.start()
+        # The game was built before tracing started, so it is not traced.
+        untraced = 0 if tracing else self.fixed
+        try:
+            for sample in range(self.samples):
+                if not self.streaming:
+                    session = self.session()
+                    self.durations.append(len(session))
+                    self.maxima.append(max(session, default=self.init_stake))
+                    if self.trajectories is not None:
+                        self.trajectories.append(session, self.init_stake)
+                else:
+                    stakes = self.play()
+                    if self.trajectories is not None:
+                        self.trajectories.append(stakes, self.init_stake)
+                        stakes = self.trajectories.iter_session(-1)
+                    summary = self.summarize(stakes)
+                    self.durations.append(summary.duration)
+                    self.maxima.append(summary.maximum)
+                if self.monitor is not None:
+                    self.monitor.sample()
+                if not traced:
+                    continue
+
+                used = untraced + tracemalloc.get_traced_memory()[0]
+                if used > self.memory_budget:
+                    raise MemoryBudgetError(
+                        "%d sessions used %d bytes, over the budget of %d" % (
+                            sample + 1, used, self.memory_budget))
+        finally:
+            if traced and not tracing:
+                tracemalloc.stop()
+
+    def sessions(self, samples=None, trajectories=False):
+        """Lazily simulates sessions, one for every value taken.
+
+        Nothing is simulated ahead of the caller, so breaking out of the loop
+        stops the simulation.
+
+        Stopping at the first ruined session.
+            >>> for session in simulator.sessions(1000):
+            ...     if session.ruined:
+            ...         break
+
+        :param samples: The number of sessions, the simulator's by default.
+        :param trajectories: Yield every session's stakes as a generator
+            instead of a :class:'Session'. A generator that is not fully
+            consumed is abandoned when the next one is requested.
+        :return generator:
+        """
+        samples = self.samples if samples is None else samples
+        for sample in range(samples):
+            if not trajectories:
+                yield self.summarize(self.play())
+                continue
+            stakes = self.play()
+            try:
+                yield stakes
+            finally:
+                stakes.close()
+
+    def parallel_sessions(self, samples=None, workers=None, chunk=None,
+                          seed=None):
+        """Simulates sessions in worker processes, yielding every
+        :class:'Session' as soon as the chunk it belongs to is finished.
+
+        Sessions therefore arrive out of order. Closing the generator cancels
+        the chunks that have not started yet.
+
+        :param samples: The number of sessions, the simulator's by default.
+        :param workers: The number of worker processes.
+        :param chunk: The number of sessions simulated per task.
+        :param seed: Seed from which every chunk's seed is derived.
+        :return generator:
+        """
+        samples = self.samples if samples is None else samples
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(workers)
+        chunk = chunk or max(1, -(-samples // (workers * 4)))
+        seeds = random.Random(seed)
+
+        try:
+            futures = [
+                executor.submit(
+                    simulate_sessions, self.configurations, self.player_class,
+                    min(chunk, samples - start), seeds.getrandbits(64), start)
+                for start in range(0, samples, chunk)
+            ]
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def simulate_sessions(configurations, player_class, samples, seed, first=0):
+    """Simulates a number of sessions from scratch in a worker process.
+
+    :param first: The index of the first session, used to find its spins
+        when replaying a tape.
+    :return list: A :class:'Session' for every simulated session.
+    """
+    random.seed(seed)
+    simulator = RouletteSimulator(configurations, player_class)
+    wheel = simulator.game.table.wheel
+    wheel.rng.seed(seed)
+    if hasattr(wheel, "seek"):
+        wheel.seek(first)
+    try:
+        return list(simulator.sessions(samples))
+    finally:
+        simulator.close()
@@ -0,0 +1,251 @@
+import math
+import random
+from collections import namedtuple
+from .gameObjects import Wheel
+
+Estimate = namedtuple(
+    "Estimate", ["probability", "variance", "samples", "hits", "effective"]
+)
+
+
+def martingale_state(player, cap=7):
+    """The state of a player used to pick a tilt: the consecutive losses of a
+    :class:'Martingale' combined with the number of further doubled bets its
+    stake still covers, each capped at 'cap - 1', giving 'cap * cap' states.
+    Players without a 'loss_count' are always in state 0."""
+    if not hasattr(player, "loss_count"):
+        return 0
+    stake, bet = (player.stake, player.wager * 2 ** player.loss_count)
+    runway = 0
+    while runway < cap - 1 and stake >= bet:
+        stake, bet, runway = (stake - bet, bet * 2, runway + 1)
+    return min(player.loss_count, cap - 1) * cap + runway
+
+
+class TiltedWheel(Wheel):
+    """A :class:'Wheel' that spins from a tilted distribution over its
+    :class:'Bin's.
+
+    Before every spin the :class:'Bin's that pay out on any of the
+    :class:'Bet's on the table are given a weight of 'tilt' and all other
+    :class:'Bin's a weight of 1. A tilt above 1 makes winning more likely and
+    one below 1 makes losing more likely. The tilt may depend on the state of
+    the player, in which case 'tilt' is a sequence indexed by 'state()', the
+    last tilt covering every later state. The log likelihood ratio of the fair
+    wheel against the tilted one is accumulated over the spins, so results can
+    be reweighted into unbiased estimates for the fair wheel.
+
+    Creating a :class:'TiltedWheel' that favours losing spins.
+        >>> wheel = TiltedWheel(table, 0.5)
+
+    Favouring wins while a :class:'Martingale' has not lost yet.
+        >>> wheel = TiltedWheel(table, [2.0] * 7 + [0.5],
+        ...                     state=lambda: martingale_state(player))
+    """
+
+    def __init__(self, table, tilt=1.0, rng=None, state=None):
+        """Initialize a :class:'TiltedWheel' for the bets on a table.
+
+        :param table: The :class:'Table' whose bets decide the tilt.
+        :param tilt: The weight of the winning :class:'Bin's, or a sequence
+            of weights indexed by the state.
+        :param rng: The random number generator to spin with.
+        :param state: A callable returning the current state, 0 by default.
+        """
+        super(TiltedWheel, self).__init__(rng)
+        self.table, self.log_ratio, self.trace = (table, 0.0, None)
+        self.state = (lambda: 0) if state is None else state
+        self.set_tilt(tilt)
+
+    def set_tilt(self, tilt):
+        self.tilts = [tilt] if isinstance(tilt, (int, float)) else list(tilt)
+
+    def reset(self, trace=False):
+        """Forgets the likelihood ratio accumulated so far.
+
+        :param trace: Record the state, the number of winning :class:'Bin's
+            and whether the bets won for every following spin.
+        """
+        self.log_ratio = 0.0
+        self.trace = list() if trace else None
+
+    def next(self):
+        """Selects a :class:'Bin' from the tilted distribution and accounts
+        for its likelihood ratio."""
+        state = min(self.state(), len(self.tilts) - 1)
+        tilt = self.tilts[state]
+        outcomes = [bet.outcome for bet in self.table]
+        winning = [
+            any([oc in bin_.outcomes for oc in outcomes]) for bin_ in self.bins
+        ]
+        wins = sum(winning)
+        total = tilt * wins + (38 - wins)
+
+        target = self.rng.random() * total
+        for number, won in enumerate(winning):
+            weight = tilt if won else 1.0
+            if target < weight:
+                break
+            target -= weight
+        self.log_ratio += math.log(total / (38 * weight))
+        if self.trace is not None:
+            self.trace.append((state, wins, won))
+        return self.bins[number]
+
+
+def table_limit(simulator, player, stakes):
+    """Whether a session ended because the next bet exceeded the table
+    maximum."""
+    bet, table = player.bet, simulator.game.table
+    return player.rounds > 0 and bet is not None and bet.amount > table.max
+
+
+def jackpot(multiple=10):
+    """Returns an event checking whether a session's stake reached a multiple
+    of the initial stake."""
+    def event(simulator, player, stakes):
+        return max(stakes, default=0) >= multiple * simulator.init_stake
+    return event
+
+
+def solve_tilt(spins, target, low=1 / 32, high=32.0):
+    """Finds the tilt under which the weighted expected number of wins equals
+    the weighted number observed, by bisection on its logarithm.
+
+    :param spins: Mapping of winning :class:'Bin' counts to their total
+        weight.
+    :param target: The total weight of the spins that won.
+    :return float: The tilt, clamped between 'low' and 'high'.
+    """
+    def expected(tilt):
+        return sum([weight * tilt * wins / (tilt * wins + 38 - wins)
+                    for wins, weight in spins.items()])
+
+    lower, upper = math.log(low), math.log(high)
+    if expected(low) >= target:
+        return low
+    if expected(high) <= target:
+        return high
+    for step in range(50):
+        middle = (lower + upper) / 2
+        if expected(math.exp(middle)) < target:
+            lower = middle
+        else:
+            upper = middle
+    return math.exp((lower + upper) / 2)
+
+
+class RareEventEstimator(object):
+    """Estimates the probability of rare session events by importance
+    sampling.
+
+    The simulator's table is given a :class:'TiltedWheel' and every session is
+    weighted by its likelihood ratio, so tilting the wheel towards the event
+    of interest makes it frequent without biasing the estimate. The tilt may
+    depend on the player's state, by default :func:'martingale_state', and
+    :meth:'tune' fits one tilt per state by the cross-entropy method.
+
+    Estimating the probability of reaching the table limit.
+        >>> simulator = RouletteSimulator(**configurations)
+        >>> estimator = RareEventEstimator(simulator, table_limit, seed=1)
+        >>> estimator.tune(1000)
+        >>> estimate = estimator.estimate(1000)
+    """
+
+    def __init__(self, simulator, event, tilt=1.0, seed=None,
+                 state=martingale_state):
+        """Initialize the estimator and tilt the simulator's wheel.
+
+        :param simulator: The :class:'RouletteSimulator' to run sessions with.
+        :param event: A callable taking the simulator, the player and the
+            stakes of a session and returning whether the event occurred.
+        :param tilt: The weight of the winning :class:'Bin's, or a sequence
+            of weights indexed by the player's state.
+        :param seed: Seed for the wheel and for the global :mod:'random'
+            module, which players such as :class:'Martingale' use to choose
+            their outcomes. Estimates are only reproducible with a seed.
+        :param state: A callable returning the state of a player.
+        """
+        if seed is not None:
+            random.seed(seed)
+        self.simulator, self.event = (simulator, event)
+        table = simulator.game.table
+        self.wheel = TiltedWheel(table, tilt, random.Random(seed),
+                                 lambda: state(self.simulator.player))
+        table.wheel = self.wheel
+        simulator.create_player()
+
+    def session(self, trace=False):
+        """Simulates a session and returns its likelihood weighted
+        indicator."""
+        simulator, player, stakes = (self.simulator, self.simulator.player,
+                                     list())
+        self.wheel.reset(trace)
+        while player.playing():
+            simulator.game.cycle(player)
+            stakes.append(int(player.stake))
+
+        hit = self.event(simulator, player, stakes)
+        simulator.create_player()
+        return math.exp(self.wheel.log_ratio) if hit else 0.0
+
+    def tune(self, samples=2000, rounds=6, states=49, smoothing=0.7,
+             minimum=10):
+        """Fits one tilt per player state by the cross-entropy method.
+
+        Every round simulates sessions under the current tilts and moves each
+        state's tilt towards the one that makes winning as likely as it was
+        in the sessions hitting the event, weighted by their likelihood
+        ratios. The event has to be hit at the initial tilts for the tilts
+        to move, and states seen on too few spins of those sessions keep
+        their tilt rather than being fitted to noise.
+
+        :param samples: The number of sessions per round.
+        :param rounds: The number of rounds.
+        :param states: The number of states given their own tilt.
+        :param smoothing: The fraction of the way each round moves the
+            logarithm of the tilts towards the fitted ones.
+        :param minimum: The number of spins a state needs to be fitted.
+        :return list: The tilts, indexed by state.
+        """
+        tilts = self.wheel.tilts + self.wheel.tilts[-1:] * states
+        self.wheel.set_tilt(tilts[:states])
+        for step in range(rounds):
+            spins = [dict() for state in range(states)]
+            targets, counts = ([0.0] * states, [0] * states)
+            for sample in range(samples):
+                weight = self.session(trace=True)
+                if not weight:
+                    continue
+                for state, wins, won in self.wheel.trace:
+                    spins[state][wins] = spins[state].get(wins, 0.0) + weight
+                    targets[state] += weight if won else 0.0
+                    counts[state] += 1
+
+            tilts = list(self.wheel.tilts)
+            for state in range(states):
+                if counts[state] >= minimum:
+                    fitted = solve_tilt(spins[state], targets[state])
+                    tilts[state] = math.exp(
+                        (1 - smoothing) * math.log(tilts[state]) +
+                        smoothing * math.log(fitted))
+            self.wheel.set_tilt(tilts)
+        self.wheel.reset()
+        return self.wheel.tilts
+
+    def estimate(self, samples=None):
+        """Estimates the probability of the event.
+
+        :param samples: The number of sessions, the simulator's by default.
+        :return Estimate: The unbiased estimate, the variance of that estimate,
+            the number of sessions and hits, and the effective sample size.
+        """
+        samples = self.simulator.samples if samples is None else samples
+        weights = [self.session() for sample in range(samples)]
+
+        mean = sum(weights) / samples
+        squares = sum([weight * weight for weight in weights])
+        variance = (squares / samples - mean * mean) / max(samples - 1, 1)
+        effective = (mean * samples) ** 2 / squares if squares else 0.0
+        hits = sum([1 for weight in weights if weight])
+        return Estimate(mean, max(variance, 0.0), samples, hits, effective)
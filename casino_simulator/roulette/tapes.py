@@ -0,0 +1,178 @@
+import mmap
+import random
+import struct
+from .gameObjects import Wheel
+from ..exceptions import TapeExhaustedError
+
+HEADER = struct.Struct("<4sBQ")
+OFFSET = struct.Struct("<Q")
+MAGIC = b"SPIN"
+VERSION = 1
+
+
+class RecordingWheel(Wheel):
+    """A :class:'Wheel' that records every spin it makes.
+
+    Spins are kept as one byte per spin, and the position at which every
+    session starts is kept as its offset, so the recording can later be
+    written to a tape and replayed session by session.
+
+    Recording the spins of a simulation.
+        >>> wheel = RecordingWheel()
+        >>> simulator.game.table.wheel = wheel
+        >>> simulator.gather()
+        >>> wheel.save('spins.tape')
+    """
+
+    def __init__(self, rng=None):
+        """Initialize a :class:'RecordingWheel' with an empty recording."""
+        super(RecordingWheel, self).__init__(rng)
+        self.spins, self.offsets = (bytearray(), list())
+
+    def start(self):
+        """Starts recording the spins of a new session."""
+        self.offsets.append(len(self.spins))
+
+    def next(self):
+        """Selects a random :class:'Bin' and records its number."""
+        bin_ = super(RecordingWheel, self).next()
+        if not self.offsets:
+            self.start()
+        self.spins.append(bin_.number)
+        return bin_
+
+    def save(self, path):
+        """Writes the recorded spins to a tape file."""
+        offsets = self.offsets + [len(self.spins)]
+        with open(path, "wb") as fp:
+            fp.write(HEADER.pack(MAGIC, VERSION, len(self.offsets)))
+            for offset in offsets:
+                fp.write(OFFSET.pack(offset))
+            fp.write(self.spins)
+
+
+def write_tape(path, samples, spins, seed=None):
+    """Draws a tape of the same number of spins for every session, enough for
+    any strategy that plays at most that many rounds.
+
+    :param path: The path of the tape file to write.
+    :param samples: The number of sessions on the tape.
+    :param spins: The number of spins per session.
+    :param seed: Seed for the random number generator.
+    """
+    rng = random.Random(seed)
+    with open(path, "wb") as fp:
+        fp.write(HEADER.pack(MAGIC, VERSION, samples))
+        for sample in range(samples + 1):
+            fp.write(OFFSET.pack(sample * spins))
+        for sample in range(samples):
+            fp.write(bytes([rng.randrange(38) for spin in range(spins)]))
+
+
+class SpinTape(object):
+    """A tape of recorded spins read through a memory map.
+
+    The file is mapped read-only, so any number of :class:'TapeWheel's and
+    processes reading the same tape share its pages instead of copying them.
+
+    Opening a tape.
+        >>> tape = SpinTape('spins.tape')
+        >>> len(tape), len(tape.sample(0))
+        (50, 7)
+    """
+
+    def __init__(self, path):
+        """Maps a tape file into memory.
+
+        :param path: The path of a file written by :meth:'RecordingWheel.save'.
+        """
+        self.path = path
+        with open(path, "rb") as fp:
+            self.map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.samples = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a spin tape file")
+        self.start = HEADER.size + OFFSET.size * (self.samples + 1)
+        self.view = memoryview(self.map)[self.start:]
+
+    def offset(self, sample):
+        """Returns the position of a session's first spin on the tape."""
+        return OFFSET.unpack_from(
+            self.map, HEADER.size + OFFSET.size * sample)[0]
+
+    def sample(self, sample):
+        """Returns the spins of a session without copying them.
+
+        :return memoryview: The numbers of the :class:'Bin's spun.
+        """
+        if not 0 <= sample < self.samples:
+            raise TapeExhaustedError("no session %d on the tape" % sample)
+        return self.view[self.offset(sample):self.offset(sample + 1)]
+
+    def close(self):
+        """Unmaps the tape. The views returned by :meth:'sample' share the
+        map, so they have to be released first, as :meth:'TapeWheel.close'
+        does for its own."""
+        self.view.release()
+        self.map.close()
+
+    def __len__(self):
+        return self.samples
+
+    def __repr__(self):
+        """The type representation of a :class:'SpinTape' object."""
+        return "<SpinTape '%d Sessions'>" % self.samples
+
+
+class TapeWheel(Wheel):
+    """A :class:'Wheel' replaying the spins recorded on a :class:'SpinTape'.
+
+    Every session replays the spins of the next session on the tape, starting
+    from the session the :class:'TapeWheel' was seeked to. Only the spins are
+    replayed; a :class:'Player' making random choices needs to be seeded for
+    sessions to be reproduced exactly.
+
+    Replaying a tape from its eleventh session.
+        >>> tape = SpinTape('spins.tape')
+        >>> wheel = TapeWheel(tape, 10)
+        >>> wheel.close()
+        >>> tape.close()
+    """
+
+    def __init__(self, tape, sample=0):
+        """Initialize a :class:'TapeWheel' reading a :class:'SpinTape'.
+
+        :param tape: The :class:'SpinTape' to replay.
+        :param sample: The session to replay first.
+        """
+        super(TapeWheel, self).__init__()
+        self.tape, self.spins, self.position = (tape, None, 0)
+        self.seek(sample)
+
+    def seek(self, sample):
+        """Makes the next session replay the given session of the tape."""
+        self.close()
+        self.sample = sample - 1
+
+    def start(self):
+        """Moves on to the spins of the next session on the tape."""
+        self.close()
+        self.sample += 1
+        self.spins, self.position = (self.tape.sample(self.sample), 0)
+
+    def close(self):
+        """Releases the spins of the current session, so that the
+        :class:'SpinTape' can be closed. The tape itself is left open."""
+        if self.spins is not None:
+            self.spins.release()
+            self.spins = None
+
+    def next(self):
+        """Returns the next :class:'Bin' recorded on the tape."""
+        if self.spins is None:
+            self.start()
+        if self.position >= len(self.spins):
+            raise TapeExhaustedError(
+                "session %d has no more spins" % self.sample)
+        number, self.position = (self.spins[self.position], self.position + 1)
+        return self.bins[number]
@@ -0,0 +1,151 @@
+import copy
+import itertools
+import statistics
+import sys
+from .gameObjects import RouletteSimulator
+
+axes = {
+    "wager": ("player", "wager"),
+    "init_stake": ("session", "init_stake"),
+    "init_duration": ("session", "init_duration"),
+    "table_min": ("game", "table_limits", "min"),
+    "table_max": ("game", "table_limits", "max"),
+}
+
+
+def median_maximum(sessions):
+    return statistics.median([session.maximum for session in sessions])
+
+
+def mean_final(sessions):
+    return statistics.mean([session.final for session in sessions])
+
+
+def ruin_rate(sessions):
+    return sum([session.ruined for session in sessions]) / len(sessions)
+
+
+objectives = {
+    "median_maximum": (median_maximum, True),
+    "mean_final": (mean_final, True),
+    "ruin_rate": (ruin_rate, False),
+}
+
+
+def grid(**values):
+    """Returns every combination of the given parameter values.
+
+        >>> grid(wager=[5, 10], table_max=[500])
+        [{'wager': 5, 'table_max': 500}, {'wager': 10, 'table_max': 500}]
+    """
+    names = list(values)
+    return [dict(zip(names, combination))
+            for combination in itertools.product(*values.values())]
+
+
+class Candidate(object):
+    """A configuration under evaluation together with the sessions it has
+    produced so far."""
+
+    def __init__(self, params, configurations, player_class):
+        """Initialize a :class:'Candidate' from base configurations overridden
+        by the given parameters."""
+        self.params, self.score = (params, None)
+        configurations = copy.deepcopy(configurations)
+        configurations.setdefault("player", {})
+        for name, value in params.items():
+            *path, key = axes[name]
+            section = configurations
+            for step in path:
+                section = section[step]
+            section[key] = value
+
+        self.simulator = RouletteSimulator(configurations, player_class)
+        self.stream = self.simulator.sessions(sys.maxsize)
+        self.results = list()
+
+    def extend(self, samples):
+        """Simulates sessions until the :class:'Candidate' has a number of
+        them, keeping those already simulated."""
+        missing = samples - len(self.results)
+        self.results.extend(itertools.islice(self.stream, max(missing, 0)))
+
+    def close(self):
+        """Stops simulating sessions and closes the simulator, keeping the
+        sessions already simulated."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+            self.simulator.close()
+
+    def __repr__(self):
+        """The type representation of a :class:'Candidate' object."""
+        return "<Candidate %r %s after %d>" % (
+            self.params, self.score, len(self.results))
+
+
+class SuccessiveHalving(object):
+    """Finds the best configurations among many by successive halving.
+
+    Every :class:'Candidate' starts with a small number of sessions. After
+    each rung the worse candidates are discarded, keeping one in every 'eta',
+    and the survivors are topped up to 'eta' times as many sessions, reusing
+    the sessions they already have. Discarded candidates are closed.
+
+    Tuning the wager of a :class:'Martingale' player.
+        >>> search = SuccessiveHalving(configurations, "Martingale",
+        ...                            grid(wager=[5, 10, 20, 40]))
+        >>> best = search.run()
+    """
+
+    def __init__(self, configurations, player_class, candidates,
+                 objective="median_maximum", maximize=None, samples=8, eta=2):
+        """Initialize the search.
+
+        :param configurations: Base simulator configurations.
+        :param player_class: The name of the :class:'Player' class to use.
+        :param candidates: Parameter dicts overriding the configurations,
+            with keys from 'axes'.
+        :param objective: The name of an objective in 'objectives' or a
+            callable scoring a list of :class:'Session's.
+        :param maximize: Whether higher scores are better. Named objectives
+            know their own direction; callables are maximized by default.
+        :param samples: The number of sessions in the first rung.
+        :param eta: The factor by which candidates are cut and sessions grow,
+            at least 2 so that every rung discards candidates.
+        """
+        if eta < 2:
+            raise ValueError("eta must be at least 2, got %r" % eta)
+        if objective in objectives:
+            objective, direction = objectives[objective]
+            maximize = direction if maximize is None else maximize
+        self.objective = objective
+        self.maximize = True if maximize is None else maximize
+        self.samples, self.eta = (samples, eta)
+        self.candidates = [Candidate(params, configurations, player_class)
+                           for params in candidates]
+
+    @property
+    def spent(self):
+        """The total number of sessions simulated so far."""
+        return sum([len(candidate.results) for candidate in self.candidates])
+
+    def run(self, keep=1):
+        """Runs rungs until no more than 'keep' candidates are left.
+
+        :return list: The surviving :class:'Candidate's, best first.
+        """
+        alive, samples = (list(self.candidates), self.samples)
+        while True:
+            for candidate in alive:
+                candidate.extend(samples)
+                candidate.score = self.objective(candidate.results)
+            alive.sort(key=lambda candidate: candidate.score,
+                       reverse=self.maximize)
+            if len(alive) <= keep:
+                return alive
+            survivors = max(keep, len(alive) // self.eta)
+            for candidate in alive[survivors:]:
+                candidate.close()
+            alive = alive[:survivors]
+            samples *= self.eta
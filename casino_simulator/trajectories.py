@@ -0,0 +1,141 @@
+import struct
+import sys
+from array import array
+
+HEADER = struct.Struct("<4sBcQQQ")
+MAGIC = b"TRJS"
+VERSION = 1
+
+
+class TrajectoryStore(object):
+    """A compact store of stake trajectories, one per game session.
+
+    Every round of a session is stored as the change in stake from the round
+    before it, the first one relative to the initial stake. Changes are kept
+    in a small-width integer array; those that do not fit are replaced by an
+    escape value and kept in a separate 64-bit overflow array. Offsets into
+    both arrays are recorded per session so any session can be decoded on its
+    own.
+
+    Storing and reading back trajectories.
+        >>> store = TrajectoryStore()
+        >>> store.append([90, 110, 70], 100)
+        >>> store[0], len(store)
+        ([90, 110, 70], 1)
+    """
+
+    def __init__(self, typecode="h"):
+        """Initialize an empty store.
+
+        :param typecode: The :mod:'array' typecode used for the deltas.
+        """
+        self.typecode = typecode
+        self.deltas, self.overflow = (array(typecode), array("q"))
+        self.stakes = array("q")
+        self.offsets, self.escapes = (array("Q", [0]), array("Q", [0]))
+
+        bits = self.deltas.itemsize * 8
+        self.escape, self.high = (-(1 << (bits - 1)), (1 << (bits - 1)) - 1)
+
+    def append(self, stakes, init_stake):
+        """Encodes and stores the trajectory of a session.
+
+        :param stakes: The stakes held after every round of the session.
+        :param init_stake: The stake the session started with.
+        """
+        deltas, overflow = self.deltas, self.overflow
+        escape, high, previous = self.escape, self.high, init_stake
+        for stake in stakes:
+            delta = stake - previous
+            if escape < delta <= high:
+                deltas.append(delta)
+            else:
+                deltas.append(escape)
+                overflow.append(delta)
+            previous = stake
+
+        self.stakes.append(init_stake)
+        self.offsets.append(len(deltas))
+        self.escapes.append(len(overflow))
+
+    def session_index(self, index):
+        """Resolves a possibly negative session index, raising an
+        :class:'IndexError' when it is out of range."""
+        if not -len(self) <= index < len(self):
+            raise IndexError("session index out of range")
+        return index % len(self)
+
+    def iter_session(self, index):
+        """Decodes the trajectory of a session one round at a time.
+
+        :param index: The index of the session.
+        :return generator: The stakes held after every round.
+        """
+        index = self.session_index(index)
+        deltas, overflow, escape = self.deltas, self.overflow, self.escape
+        spilled = self.escapes[index]
+        stake = self.stakes[index]
+        for position in range(self.offsets[index], self.offsets[index + 1]):
+            delta = deltas[position]
+            if delta == escape:
+                delta, spilled = overflow[spilled], spilled + 1
+            stake += delta
+            yield stake
+
+    def duration(self, index):
+        """Returns the number of rounds in a session without decoding it."""
+        index = self.session_index(index)
+        return self.offsets[index + 1] - self.offsets[index]
+
+    @property
+    def nbytes(self):
+        """The number of bytes used by the encoded trajectories."""
+        arrays = (self.deltas, self.overflow, self.stakes, self.offsets,
+                  self.escapes)
+        return sum([len(values) * values.itemsize for values in arrays])
+
+    def dump(self, fp):
+        """Writes the store to a binary file object."""
+        fp.write(HEADER.pack(MAGIC, VERSION, self.typecode.encode(),
+                             len(self), len(self.deltas), len(self.overflow)))
+        for values in (self.stakes, self.offsets, self.escapes, self.deltas,
+                       self.overflow):
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            values.tofile(fp)
+
+    @classmethod
+    def load(cls, fp):
+        """Reads a store previously written by :meth:'dump'."""
+        magic, version, typecode, sessions, deltas, overflow = HEADER.unpack(
+            fp.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a trajectory store file")
+
+        store = cls(typecode.decode())
+        store.offsets, store.escapes = (array("Q"), array("Q"))
+        counts = (sessions, sessions + 1, sessions + 1, deltas, overflow)
+        names = ("stakes", "offsets", "escapes", "deltas", "overflow")
+        for name, count in zip(names, counts):
+            values = getattr(store, name)
+            values.fromfile(fp, count)
+            if sys.byteorder == "big":
+                values.byteswap()
+        return store
+
+    def __len__(self):
+        return len(self.stakes)
+
+    def __getitem__(self, index):
+        """Returns the decoded trajectory of a session as a list."""
+        return list(self.iter_session(index))
+
+    def __iter__(self):
+        """Returns an iterator of lazily decoded trajectories, one per
+        session."""
+        return (self.iter_session(index) for index in range(len(self)))
+
+    def __repr__(self):
+        """The type representation of a :class:'TrajectoryStore' object."""
+        return "<TrajectoryStore '%d Sessions'>" % len(self)
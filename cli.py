@@ -11,13 +11,51 @@ def main():
     """
 
 
+def size(ctx, param, value):
+    """Converts a size option such as 64M into a number of bytes."""
+    from casino_simulator.profiling import parse_size
+
+    if value is None:
+        return None
+    try:
+        return parse_size(value)
+    except ValueError:
+        raise click.BadParameter(
+            f"'{value}' is not a size such as 512K, 64M or 1G.")
+
+
 @main.command()
 @click.argument('game')
-def play(game):
+@click.option(
+    '--profile-memory', is_flag=True,
+    help='Report peak and per-component memory allocations.'
+)
+@click.option(
+    '--memory-budget', default=None, callback=size,
+    help='Stay under a size of traced memory such as 64M.'
+)
+def play(game, profile_memory, memory_budget):
     """Simulate the desired game with the selected player."""
     import casino_simulator
+    from casino_simulator.exceptions import MemoryBudgetError
+
+    options = {'profile_memory': profile_memory}
+    if memory_budget is not None:
+        options['memory_budget'] = memory_budget
     click.echo(f"Starting '{game.capitalize()}' simulation...")
-    casino_simulator.simulate(game)
+    try:
+        casino_simulator.simulate(game, **options)
+    except MemoryBudgetError as error:
+        raise click.ClickException(f"Memory budget exceeded: {error}")
+
+
+@main.command()
+@click.argument('game')
+def bench(game):
+    """Measures the per-round cost of the desired game."""
+    import casino_simulator
+    click.echo(f"Benchmarking '{game.capitalize()}' simulation...")
+    casino_simulator.benchmark(game)
 
 
 @main.command()
@@ -27,15 +65,30 @@ def play(game):
     default='0', type=int,
     help='The level of verbosity to use when running the tests.'
 )
-def test(game, verbosity):
+@click.option(
+    '--budget', '-b',
+    default=30.0, type=float,
+    help='Fail if the tests took longer than this many seconds. Checked '
+         'once they finish, so slow tests are not interrupted.'
+)
+def test(game, verbosity, budget):
     """Runs tests on the package as a whole as well as on specific games."""
+    import time
     import unittest
 
     message = 'simulator' if game == 'all' else f"'{game.capitalize()}' game"
     location = '' if game == 'all' else game
     click.echo(f"Running tests on the {message}...")
     tests = unittest.TestLoader().discover(f'tests/{location}')
-    unittest.TextTestRunner(verbosity=verbosity).run(tests)
+    start = time.perf_counter()
+    result = unittest.TextTestRunner(verbosity=verbosity).run(tests)
+    elapsed = time.perf_counter() - start
+
+    if elapsed > budget:
+        click.echo(
+            f"Tests took {elapsed:.1f}s, over the {budget:.1f}s budget.")
+    if elapsed > budget or not result.wasSuccessful():
+        raise SystemExit(1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,17 @@
+import copy
+import random
+from casino_simulator.roulette import configurations
+from casino_simulator.roulette.gameObjects import RouletteSimulator
+
+SEED = 20181018
+
+
+def simulator(**session):
+    """Creates a seeded Martingale simulator from the default
+    configurations, overriding the given session configurations."""
+    random.seed(SEED)
+    settings = copy.deepcopy(configurations["configurations"])
+    settings["session"].update(session)
+    simulator = RouletteSimulator(settings, "Martingale")
+    simulator.game.table.wheel.rng.seed(SEED)
+    return simulator
@@ -0,0 +1,202 @@
+import os
+import random
+import tempfile
+import unittest
+from fractions import Fraction
+from casino_simulator.gameObjects import Bet
+from casino_simulator.roulette.gameObjects import Wheel
+from casino_simulator.roulette.tapes import (RecordingWheel, SpinTape,
+                                             TapeWheel, write_tape)
+from tests.roulette import SEED, simulator
+
+# Number of bins and odds of every kind of outcome on an American wheel.
+LAYOUT = {
+    "Straight": (1, 35), "Split": (2, 17), "Street": (3, 11),
+    "Corner": (4, 8), "Five": (5, 6), "Line": (6, 5),
+    "Dozen": (12, 2), "Column": (12, 2), "Even money": (18, 1),
+}
+COUNTS = {
+    "Straight": 38, "Split": 57, "Street": 12, "Corner": 22, "Five": 1,
+    "Line": 11, "Dozen": 3, "Column": 3, "Even money": 6,
+}
+
+
+def kind(outcome):
+    """Returns the kind of bet an outcome belongs to."""
+    name = outcome.name
+    if name == "00-0-1-2-3":
+        return "Five"
+    if name.split()[0] in LAYOUT:
+        return name.split()[0]
+    return "Straight" if name.isdigit() else "Even money"
+
+
+def bins_of(wheel, outcome):
+    return [bin_ for bin_ in wheel.bins if outcome in bin_.outcomes]
+
+
+class TestLayout(unittest.TestCase):
+    """The wheel built by the :class:'BinBuilder'."""
+
+    def setUp(self):
+        self.wheel = Wheel(random.Random(SEED))
+
+    def test_outcome_counts(self):
+        counts = dict.fromkeys(COUNTS, 0)
+        for outcome in self.wheel.outcomes:
+            counts[kind(outcome)] += 1
+        self.assertEqual(counts, COUNTS)
+
+    def test_bins_per_outcome(self):
+        for outcome in self.wheel.outcomes:
+            with self.subTest(outcome=outcome.name):
+                bins = LAYOUT[kind(outcome)][0]
+                self.assertEqual(len(bins_of(self.wheel, outcome)), bins)
+
+    def test_straight_bets(self):
+        for number, bin_ in enumerate(self.wheel.bins):
+            name = "00" if number == 37 else str(number)
+            self.assertIn(self.wheel.get_outcome(name), bin_.outcomes)
+
+
+class TestPayouts(unittest.TestCase):
+    """The odds produced by the :class:'OutcomeFactory'."""
+
+    def setUp(self):
+        self.wheel = Wheel(random.Random(SEED))
+
+    def test_odds(self):
+        for outcome in self.wheel.outcomes:
+            with self.subTest(outcome=outcome.name):
+                odds = LAYOUT[kind(outcome)][1]
+                self.assertEqual(outcome.odds, Fraction(odds))
+
+    def test_win_amount(self):
+        for outcome in self.wheel.outcomes:
+            bet = Bet(10, outcome)
+            self.assertEqual(bet.win_amount(), 10 * (outcome.odds + 1))
+            self.assertEqual(bet.lose_amount(), 10)
+
+
+class TestReturnToPlayer(unittest.TestCase):
+    """The return to player of every outcome against the house edge."""
+
+    def setUp(self):
+        self.wheel = Wheel(random.Random(SEED))
+
+    def test_analytic(self):
+        for outcome in self.wheel.outcomes:
+            with self.subTest(outcome=outcome.name):
+                rtp = len(bins_of(self.wheel, outcome)) * (outcome.odds + 1)
+                edge = Fraction(3 if kind(outcome) == "Five" else 2, 38)
+                self.assertEqual(Fraction(rtp, 38), 1 - edge)
+
+    def test_monte_carlo(self):
+        spins = 40000
+        for name in ("Red", "Dozen 2", "Split 1-2", "00-0-1-2-3"):
+            with self.subTest(outcome=name):
+                outcome = self.wheel.get_outcome(name)
+                bins = len(bins_of(self.wheel, outcome))
+                wins = sum([outcome in self.wheel.next().outcomes
+                            for spin in range(spins)])
+                mean = spins * bins / 38
+                deviation = (mean * (1 - bins / 38)) ** 0.5
+                self.assertLess(abs(wins - mean), 4 * deviation)
+
+
+class TestEngines(unittest.TestCase):
+    """Faster simulation paths against the reference :meth:'gather'."""
+    samples = 1000
+
+    def reference(self):
+        reference = simulator(samples=self.samples)
+        reference.gather()
+        return reference
+
+    def test_sessions(self):
+        reference = self.reference()
+        sessions = list(simulator().sessions(self.samples))
+        self.assertEqual([session.duration for session in sessions],
+                         reference.durations)
+        self.assertEqual([session.maximum for session in sessions],
+                         reference.maxima)
+
+    def test_memory_budget(self):
+        reference = self.reference()
+        streamed = simulator(samples=self.samples, trajectories=True)
+        streamed.set_memory_budget(1 << 20)
+        streamed.gather()
+        self.assertEqual(list(streamed.durations), reference.durations)
+        self.assertEqual(list(streamed.maxima), reference.maxima)
+
+    def test_tape_replay(self):
+        recorded = simulator()
+        recorded.game.table.wheel = RecordingWheel()
+        expected = list(recorded.sessions(self.samples))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spins.tape")
+            recorded.game.table.wheel.save(path)
+            tape = SpinTape(path)
+            replayed = simulator()
+            replayed.game.table.wheel = TapeWheel(tape)
+            self.assertEqual(list(replayed.sessions(self.samples)), expected)
+            replayed.close()
+            tape.close()
+
+    def test_parallel(self):
+        samples = 4 * self.samples
+        serial = list(simulator().sessions(samples))
+        parallel = list(simulator().parallel_sessions(
+            samples, workers=2, seed=SEED))
+        self.assertEqual(len(parallel), samples)
+
+        for field in ("duration", "maximum"):
+            with self.subTest(field=field):
+                a = [getattr(session, field) for session in serial]
+                b = [getattr(session, field) for session in parallel]
+                self.assertLess(abs(z_score(a, b)), 4)
+
+
+class TestTapes(unittest.TestCase):
+    """Opening, replaying and closing a :class:'SpinTape'."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "spins.tape")
+        write_tape(self.path, 3, 250, seed=SEED)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_close(self):
+        tape = SpinTape(self.path)
+        wheel = TapeWheel(tape)
+        with tape.sample(0) as spins:
+            self.assertEqual(wheel.next().number, spins[0])
+        wheel.start()
+        wheel.next()
+        wheel.close()
+        tape.close()
+        self.assertTrue(tape.map.closed)
+
+    def test_simulator_close(self):
+        taped = simulator(tape=self.path, samples=3)
+        tape = taped.tape
+        self.assertEqual(len(list(taped.sessions())), 3)
+        taped.close()
+        self.assertIsNone(taped.tape)
+        self.assertTrue(tape.map.closed)
+
+def z_score(a, b):
+    """Two-sample z statistic for the difference between the means."""
+    def moments(values):
+        mean = sum(values) / len(values)
+        variance = sum([(v - mean) ** 2 for v in values]) / (len(values) - 1)
+        return mean, variance / len(values)
+    (mean_a, var_a), (mean_b, var_b) = moments(a), moments(b)
+    return (mean_a - mean_b) / ((var_a + var_b) ** 0.5 or 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from casino_simulator.roulette.floor import RouletteFloor
+from tests.roulette import SEED
+
+
+def floor(tables=4, seats=3, players=60, arrival_rate=0.5):
+    """Creates a small seeded floor on which players have to queue."""
+    configurations = {
+        "floor": {"tables": tables, "seats": seats, "players": players,
+                  "arrival_rate": arrival_rate},
+        "session": {"init_duration": 50, "init_stake": 100},
+    }
+    return RouletteFloor(configurations, "Martingale", seed=SEED)
+
+
+class TestRouletteFloor(unittest.TestCase):
+    """The event-driven simulation of a :class:'RouletteFloor'."""
+
+    def test_run(self):
+        floor_ = floor()
+        until = 0.0
+        while True:
+            until += floor_.spin_interval / 2
+            floor_.run(until)
+            for table in floor_.tables:
+                self.assertLessEqual(len(table.players), table.seats)
+            if not floor_.events:
+                break
+
+        self.assertEqual(floor_.arrived, 60)
+        self.assertEqual(floor_.departed, floor_.arrived)
+        self.assertFalse(floor_.waiting)
+        self.assertGreater(floor_.waited, 0.0)
+
+    def test_report(self):
+        floor_ = floor()
+        reports = floor_.run()
+        self.assertEqual(len(reports), 4)
+        for table, report in zip(floor_.tables, reports):
+            self.assertEqual(report.spins, table.spins)
+            self.assertEqual(report.throughput, table.spins / floor_.now)
+            self.assertGreater(report.occupancy, 0.0)
+            self.assertLessEqual(report.occupancy, 1.0)
+            self.assertGreaterEqual(report.rounds, report.spins)
+
+    def test_seeded(self):
+        self.assertEqual(floor().run(), floor().run())
+
+    def test_waiting_player_is_seated(self):
+        floor_ = floor(tables=1, seats=1)
+        table = floor_.tables[0]
+        floor_.arrive()
+        floor_.arrive()
+        self.assertEqual(len(floor_.waiting), 1)
+        self.assertEqual(floor_.vacant, [])
+
+        first = table.players[0]
+        floor_.now = 10.0
+        floor_.leave(table, first)
+        self.assertEqual(len(floor_.waiting), 0)
+        self.assertEqual(len(table.players), 1)
+        self.assertIsNot(table.players[0], first)
+        self.assertEqual(floor_.waited, 10.0)
+
+    def test_fill_and_open(self):
+        floor_ = floor()
+        first, last = floor_.tables[0], floor_.tables[-1]
+        floor_.fill(first)
+        floor_.fill(first)
+        self.assertNotIn(first, floor_.vacant)
+        self.assertIs(floor_.vacant[0], last)
+        for index, table in enumerate(floor_.vacant):
+            self.assertEqual(floor_.position[table.number], index)
+
+        floor_.open(first)
+        floor_.open(first)
+        self.assertEqual(len(floor_.vacant), 4)
+        self.assertEqual(floor_.position[first.number], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import random
+import unittest
+from casino_simulator.exceptions import MemoryBudgetError
+from casino_simulator.roulette.gameObjects import RouletteTable, Martingale
+from tests.roulette import SEED, simulator
+
+
+class TestRoulettePlayer(unittest.TestCase):
+    """The round protocol of a :class:'RoulettePlayer'."""
+
+    def setUp(self):
+        random.seed(SEED)
+        self.table = RouletteTable(5, 500)
+        self.player = Martingale(self.table, wager=10)
+        self.player.set_rounds(10)
+
+    def test_one_decision_per_round(self):
+        self.player.set_stake(100)
+        self.assertTrue(self.player.playing())
+        bet = self.player.bet
+        self.player.place_bet()
+        self.assertEqual(list(self.table), [bet])
+        self.assertEqual((self.player.stake, self.player.rounds), (90, 9))
+
+    def test_one_validation_per_round(self):
+        checks = list()
+        can_bet = self.player.can_bet
+        self.player.can_bet = lambda bet: checks.append(bet) or can_bet(bet)
+        self.player.set_stake(100)
+        self.assertTrue(self.player.playing())
+        self.player.place_bet()
+        self.assertEqual(len(checks), 1)
+        self.assertIsNone(self.player.bet)
+        self.assertFalse(self.player.accepted)
+
+    def test_rejected_bet_is_not_placed(self):
+        self.player.set_stake(5)
+        self.assertFalse(self.player.playing())
+        self.player.place_bet()
+        self.assertEqual(list(self.table), [])
+        self.assertEqual((self.player.stake, self.player.rounds), (5, 10))
+        self.assertTrue(self.player.is_ruined())
+
+    def test_table_limit_is_not_ruin(self):
+        self.player.set_stake(10000)
+        self.player.loss_count = 6
+        self.assertFalse(self.player.playing())
+        self.assertGreater(self.player.bet.amount, self.table.max)
+        self.assertFalse(self.player.is_ruined())
+
+
+class TestSessions(unittest.TestCase):
+    """The :class:'Session's summarized by a :class:'RouletteSimulator'."""
+
+    def test_table_limit_is_not_ruin(self):
+        # A stake this large always covers the doubled bets, so every session
+        # ends early because a bet goes over the table maximum.
+        for session in simulator(init_stake=100000).sessions(20):
+            self.assertLess(session.duration, 250)
+            self.assertGreaterEqual(session.final, 5)
+            self.assertFalse(session.ruined)
+
+    def test_ruin(self):
+        sessions = list(simulator(init_stake=100).sessions(20))
+        for session in sessions:
+            if session.final < 5:
+                self.assertTrue(session.ruined)
+        self.assertTrue(any([session.ruined for session in sessions]))
+
+
+class TestMemoryBudget(unittest.TestCase):
+    """Planning :meth:'RouletteSimulator.gather' under a memory budget."""
+    samples = 1000
+
+    def test_rejected_up_front(self):
+        budgeted = simulator(samples=self.samples)
+        with self.assertRaises(MemoryBudgetError):
+            budgeted.set_memory_budget(1024)
+        self.assertEqual(list(budgeted.durations), [])
+
+    def test_streams(self):
+        # Few but long sessions: their trajectories fit, a list does not.
+        session = {"samples": 10, "init_duration": 10000, "trajectories": True}
+        reference = simulator(**session)
+        reference.gather()
+        budgeted = simulator(**session)
+        budgeted.set_memory_budget(300 << 10)
+        self.assertTrue(budgeted.streaming)
+        self.assertTrue(budgeted.traced)
+        budgeted.gather()
+        self.assertEqual(list(budgeted.durations), reference.durations)
+        self.assertEqual(list(budgeted.maxima), reference.maxima)
+        self.assertEqual(list(map(list, budgeted.trajectories)),
+                         list(map(list, reference.trajectories)))
+
+    def test_drops_trajectories(self):
+        session = {"samples": 10, "init_duration": 10000, "trajectories": True}
+        budgeted = simulator(**session)
+        budgeted.set_memory_budget(100 << 10)
+        self.assertTrue(budgeted.streaming)
+        self.assertIsNone(budgeted.trajectories)
+        budgeted.gather()
+        self.assertEqual(len(budgeted.durations), 10)
+
+    def test_untraced_when_it_fits(self):
+        reference = simulator(samples=self.samples, trajectories=True)
+        reference.gather()
+        budgeted = simulator(samples=self.samples, trajectories=True)
+        budgeted.set_memory_budget(4 << 20)
+        self.assertFalse(budgeted.streaming or budgeted.traced)
+        budgeted.gather()
+        self.assertEqual(list(budgeted.durations), reference.durations)
+        self.assertEqual(len(budgeted.trajectories), self.samples)
+
+
+if __name__ == "__main__":
+    unittest.main()
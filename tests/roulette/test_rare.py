@@ -0,0 +1,39 @@
+import copy
+import unittest
+from casino_simulator.roulette import configurations
+from casino_simulator.roulette.gameObjects import RouletteSimulator
+from casino_simulator.roulette.rare import RareEventEstimator, table_limit
+from tests.roulette import SEED
+
+
+def estimator(**options):
+    simulator = RouletteSimulator(**copy.deepcopy(configurations))
+    return RareEventEstimator(simulator, table_limit, seed=SEED, **options)
+
+
+class TestRareEventEstimator(unittest.TestCase):
+    samples = 1500
+
+    def test_untilted_is_naive(self):
+        estimate = estimator().estimate(self.samples)
+        self.assertEqual(estimate.probability, estimate.hits / self.samples)
+        self.assertAlmostEqual(estimate.effective, estimate.hits)
+
+    def test_seeded(self):
+        self.assertEqual(estimator().estimate(200), estimator().estimate(200))
+
+    def test_tuned(self):
+        naive = estimator().estimate(self.samples)
+        tuned = estimator()
+        tuned.tune(800, rounds=4)
+        estimate = tuned.estimate(self.samples)
+
+        p = estimate.probability
+        self.assertLess(estimate.variance, p * (1 - p) / self.samples / 2)
+        error = (naive.variance + estimate.variance) ** 0.5
+        self.assertLess(abs(estimate.probability - naive.probability),
+                        4 * error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import copy
+import os
+import random
+import tempfile
+import unittest
+from casino_simulator.roulette import configurations
+from casino_simulator.roulette.tapes import write_tape
+from casino_simulator.roulette.tuning import (SuccessiveHalving, grid,
+                                              ruin_rate)
+from tests.roulette import SEED
+
+
+class TestSuccessiveHalving(unittest.TestCase):
+    """Tuning :class:'Martingale' configurations by successive halving."""
+
+    def setUp(self):
+        random.seed(SEED)
+        self.configurations = copy.deepcopy(configurations["configurations"])
+        # Every Martingale session ends early, ruined with a small stake and
+        # on the table limit with a large one.
+        self.candidates = grid(init_stake=[100, 100000], wager=[10])
+
+    def test_ruin_rate(self):
+        search = SuccessiveHalving(self.configurations, "Martingale",
+                                   self.candidates, "ruin_rate", samples=16)
+        poor, rich = search.candidates
+        poor.extend(16)
+        rich.extend(16)
+        self.assertGreater(ruin_rate(poor.results), 0.5)
+        self.assertEqual(ruin_rate(rich.results), 0.0)
+
+        best, = search.run()
+        self.assertEqual(best.params["init_stake"], 100000)
+        self.assertEqual(best.score, 0.0)
+
+    def test_discarded_are_closed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spins.tape")
+            write_tape(path, 16, 250, seed=SEED)
+            self.configurations["session"]["tape"] = path
+            search = SuccessiveHalving(self.configurations, "Martingale",
+                                       self.candidates, "ruin_rate",
+                                       samples=4)
+            best, = search.run()
+            worst, = [candidate for candidate in search.candidates
+                      if candidate is not best]
+            tape = best.simulator.tape
+            self.assertIsNone(worst.stream)
+            self.assertIsNone(worst.simulator.tape)
+            self.assertEqual(len(worst.results), 4)
+
+            best.close()
+            self.assertTrue(tape.map.closed)
+
+    def test_eta(self):
+        for eta in (0, 1):
+            with self.assertRaises(ValueError):
+                SuccessiveHalving(self.configurations, "Martingale",
+                                  self.candidates, eta=eta)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import io
+import unittest
+from casino_simulator.trajectories import TrajectoryStore
+
+SESSIONS = (
+    ([90, 110, 70], 100),
+    # Changes of 32767, -32767, -32767, -32768 and 32768: the int16 limits
+    # fit, the escape value itself and anything beyond go to the overflow.
+    ([32867, 100, -32667, -65435, -32667], 100),
+    ([], 250),
+    ([10 ** 12, 0], 0),
+)
+
+
+class TestTrajectoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = TrajectoryStore()
+        for stakes, init_stake in SESSIONS:
+            self.store.append(stakes, init_stake)
+
+    def test_decode(self):
+        for index, (stakes, init_stake) in enumerate(SESSIONS):
+            self.assertEqual(self.store[index], stakes)
+            self.assertEqual(list(self.store.iter_session(index)), stakes)
+            self.assertEqual(self.store.duration(index), len(stakes))
+        self.assertEqual(self.store[-1], SESSIONS[-1][0])
+
+    def test_escapes(self):
+        self.assertEqual(list(self.store.overflow),
+                         [-32768, 32768, 10 ** 12, -10 ** 12])
+        self.assertIn(32767, self.store.deltas)
+        self.assertIn(-32767, self.store.deltas)
+
+    def test_out_of_range(self):
+        for index in (len(SESSIONS), -len(SESSIONS) - 1):
+            with self.assertRaises(IndexError):
+                self.store[index]
+            with self.assertRaises(IndexError):
+                self.store.duration(index)
+        with self.assertRaises(IndexError):
+            TrajectoryStore().duration(0)
+
+    def test_dump_load(self):
+        buffer = io.BytesIO()
+        self.store.dump(buffer)
+        buffer.seek(0)
+        loaded = TrajectoryStore.load(buffer)
+        self.assertEqual(len(loaded), len(self.store))
+        self.assertEqual([list(stakes) for stakes in loaded],
+                         [list(stakes) for stakes in self.store])
+        self.assertEqual(loaded.nbytes, self.store.nbytes)
+
+    def test_load_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            TrajectoryStore.load(io.BytesIO(b"\0" * 64))
+
+
+if __name__ == "__main__":
+    unittest.main()